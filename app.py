@@ -1,16 +1,39 @@
+import atexit
+import os
+import threading
+import time
+import uuid
 import streamlit as st
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
 from prompts import (
     create_technical_question_prompt,
     create_tech_stack_evaluation_prompt,
     create_error_recovery_prompt,
     create_clarification_prompt,
     create_follow_up_prompt,
+    create_follow_up_prompt_prefix,
     create_interview_conclusion_prompt,
     detect_nonsensical_input
 )
-from output import generate_response
+from output import (
+    generate_response,
+    prefill_prompt_prefix,
+    PrefillCacheStore,
+    load_model_and_tokenizer,
+    enable_static_generation,
+    uses_static_generation
+)
+from scheduler import (
+    RequestScheduler,
+    SchedulerBusyError,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_OPENING,
+    PRIORITY_BACKGROUND,
+    PRIORITY_SPECULATIVE
+)
+from transcripts import TranscriptExporter
+from question_bank import load_question_bank, DIRECT_MATCH_SCORE, FALLBACK_MATCH_SCORE
+from tech_catalog import TECH_CATALOG
 
 # Set page config
 st.set_page_config(
@@ -34,81 +57,13 @@ if 'clarification_input' not in st.session_state:
     st.session_state.clarification_input = ""
 if 'error_input' not in st.session_state:
     st.session_state.error_input = ""
+if 'selection_order' not in st.session_state:
+    st.session_state.selection_order = []
 
-# Tech stack dictionary organized by categories
-TECH_STACK_CATEGORIES = {
-    "Programming Languages": {
-        "Python": "Python programming language",
-        "JavaScript": "JavaScript programming language",
-        "Java": "Java programming language",
-        "C++": "C++ programming language",
-        "C#": "C# programming language",
-        "Go": "Go programming language",
-        "Rust": "Rust programming language",
-        "Ruby": "Ruby programming language",
-        "PHP": "PHP programming language",
-        "TypeScript": "TypeScript programming language",
-        "Swift": "Swift programming language",
-        "Kotlin": "Kotlin programming language"
-    },
-    "Web Frameworks": {
-        "Django": "Django web framework (Python)",
-        "Flask": "Flask web framework (Python)",
-        "FastAPI": "FastAPI web framework (Python)",
-        "React": "React frontend library (JavaScript)",
-        "Angular": "Angular frontend framework (TypeScript)",
-        "Vue.js": "Vue.js frontend framework (JavaScript)",
-        "Spring Boot": "Spring Boot framework (Java)",
-        "Express.js": "Express.js backend framework (Node.js)",
-        "Laravel": "Laravel framework (PHP)",
-        "Ruby on Rails": "Ruby on Rails framework (Ruby)",
-        "ASP.NET Core": "ASP.NET Core framework (C#)"
-    },
-    "Databases": {
-        "PostgreSQL": "PostgreSQL relational database",
-        "MySQL": "MySQL relational database",
-        "MongoDB": "MongoDB NoSQL database",
-        "Redis": "Redis in-memory data store",
-        "Elasticsearch": "Elasticsearch search engine",
-        "Oracle": "Oracle database",
-        "MS SQL Server": "Microsoft SQL Server database",
-        "Cassandra": "Apache Cassandra distributed database",
-        "Neo4j": "Neo4j graph database"
-    },
-    "DevOps & Cloud": {
-        "Docker": "Docker containerization platform",
-        "Kubernetes": "Kubernetes container orchestration",
-        "AWS": "Amazon Web Services cloud platform",
-        "Azure": "Microsoft Azure cloud platform",
-        "GCP": "Google Cloud Platform",
-        "Jenkins": "Jenkins automation server",
-        "GitLab CI/CD": "GitLab CI/CD pipeline",
-        "GitHub Actions": "GitHub Actions automation",
-        "Terraform": "Terraform infrastructure as code",
-        "Ansible": "Ansible automation tool"
-    },
-    "Frontend Technologies": {
-        "HTML5": "HTML5 markup language",
-        "CSS3": "CSS3 styling language",
-        "SASS/SCSS": "SASS/SCSS CSS preprocessor",
-        "Tailwind CSS": "Tailwind CSS utility framework",
-        "Bootstrap": "Bootstrap CSS framework",
-        "Material UI": "Material UI component library",
-        "Redux": "Redux state management",
-        "GraphQL": "GraphQL query language",
-        "REST API": "RESTful API architecture"
-    },
-    "Tools & Others": {
-        "Git": "Git version control",
-        "Linux": "Linux operating system",
-        "Nginx": "Nginx web server",
-        "RabbitMQ": "RabbitMQ message broker",
-        "Kafka": "Apache Kafka streaming platform",
-        "Celery": "Celery task queue",
-        "Prometheus": "Prometheus monitoring",
-        "Grafana": "Grafana analytics platform",
-        "ELK Stack": "Elasticsearch, Logstash, Kibana stack"
-    }
+# Multiselect widget key for each catalog category
+CATEGORY_WIDGET_KEYS = {
+    category: f"select_{category.lower().replace(' ', '_')}"
+    for category in TECH_CATALOG.categories
 }
 
 # Experience level definitions
@@ -123,28 +78,12 @@ EXPERIENCE_LEVELS = [
 
 # Model configuration
 @st.cache_resource
-def load_model():
-    model_name = "microsoft/Phi-3-mini-4k-instruct"
-    
-    # Check if GPU is available
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    
-    # Load model with specific device configuration
-    model = AutoModelForCausalLM.from_pretrained(
-        model_name,
-        torch_dtype=torch.float16 if device == "cuda" else torch.float32,
-        low_cpu_mem_usage=True,
-        device_map="auto" if device == "cuda" else None  # Fixed device map setting
-    )
-    
-    tokenizer = AutoTokenizer.from_pretrained(
-        model_name,
-        use_fast=True
-    )
+def load_model(static_generation=False):
+    model, tokenizer, device = load_model_and_tokenizer()
     
-    # Ensure we have a pad token
-    if tokenizer.pad_token is None:
-        tokenizer.pad_token = tokenizer.eos_token
+    # Compiled decode step with one pre-allocated KV cache per scheduler slot
+    if static_generation and not enable_static_generation(model, tokenizer, num_caches=get_scheduler().max_concurrency):
+        st.warning("This model doesn't support a static KV cache; using eager generation")
     
     # Display device information
     if device == "cuda":
@@ -154,19 +93,65 @@ def load_model():
     
     return model, tokenizer, device
 
+# One scheduler shared by every session so they all queue for the same model
+@st.cache_resource
+def get_scheduler():
+    return RequestScheduler()
+
+# Speculative prefill caches from every session share one memory budget
+@st.cache_resource
+def get_prefill_store(device):
+    return PrefillCacheStore(device)
+
+# Completed interviews from every session are batched into one Parquet dataset
+@st.cache_resource
+def get_transcript_exporter():
+    exporter = TranscriptExporter(os.environ.get("TRANSCRIPT_EXPORT_DIR", "transcripts"))
+    atexit.register(exporter.close)
+    return exporter
+
+# Curated question bank, indexed once per process and memory-mapped
+@st.cache_resource
+def get_question_bank():
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+    return load_question_bank(
+        os.path.join(data_dir, "question_bank.json"),
+        os.path.join(data_dir, "question_bank_index"),
+        TECH_CATALOG
+    )
+
 class TechnicalInterviewer:
-    def __init__(self, model, tokenizer, device):
+    def __init__(self, model, tokenizer, device, scheduler=None, question_bank=None, prefill_store=None):
         self.model = model
         self.tokenizer = tokenizer
         self.device = device
+        self.scheduler = scheduler
+        self.question_bank = question_bank
+        self.prefill_store = prefill_store
+        self.session_id = uuid.uuid4().hex
         self.conversation_history = []
         self.candidate_skill_level = None
+        self.stack = None
+        self.stack_key = None
         self.tech_stack = None
         self.years_of_experience = None
+        # Template, token counts and latency of the most recent generation
+        self.last_generation = {}
+        self.conclusion = None
+        
+        # Speculative prefill of the next follow-up prompt; the finished cache
+        # lives in prefill_store under session_id
+        self._prefill_lock = threading.Lock()
+        self._prefill_thread = None
+        self._prefill_prefix = None
+        self._prefill_started = False
         
-    def set_candidate_context(self, skill_level, tech_stack, years_of_experience):
+    def set_candidate_context(self, skill_level, stack, years_of_experience):
+        # stack holds catalog IDs, primary technology first; prompts use the names
         self.candidate_skill_level = skill_level
-        self.tech_stack = tech_stack
+        self.stack = stack
+        self.stack_key = TECH_CATALOG.stack_key(stack)
+        self.tech_stack = TECH_CATALOG.stack_names(stack)
         self.years_of_experience = years_of_experience
         
     def start_interview(self):
@@ -174,8 +159,9 @@ class TechnicalInterviewer:
             skill_level=f"{self.candidate_skill_level} with {self.years_of_experience}", 
             tech_stack=self.tech_stack
         )
-        response = self.generate_response(prompt)
-        self.conversation_history.append({"role": "interviewer", "content": response})
+        response = self.generate_response(prompt, template="technical_question", priority=PRIORITY_OPENING)
+        self.record_interviewer_turn(response)
+        self.schedule_prefill()
         return response
     
     def ask_follow_up(self, candidate_response):
@@ -183,23 +169,44 @@ class TechnicalInterviewer:
         self.conversation_history.append({"role": "candidate", "content": candidate_response})
         
         # Check if response is nonsensical and handle accordingly
+        matches = []
         if detect_nonsensical_input(candidate_response):
+            template = "clarification"
             prompt = create_clarification_prompt(
                 unclear_response=candidate_response,
                 topic=self.tech_stack
             )
         else:
+            template = "follow_up"
+            if self.question_bank is not None:
+                start_time = time.perf_counter()
+                matches = self.search_question_bank(candidate_response)
+                lookup_ms = (time.perf_counter() - start_time) * 1000
+                # Close match: serve the curated question without touching the model
+                if matches and matches[0][1] >= DIRECT_MATCH_SCORE:
+                    return self.serve_bank_question(matches[0][0], lookup_ms)
             # Generate follow-up question based on candidate's response
             prompt = create_follow_up_prompt(
                 conversation_history=self.conversation_history,
                 candidate_response=candidate_response,
-                skill_level=f"{self.candidate_skill_level} with {self.years_of_experience}"
+                skill_level=f"{self.candidate_skill_level} with {self.years_of_experience}",
+                reference_questions=[question for question, _ in matches]
             )
             
-        response = self.generate_response(prompt)
+        try:
+            response = self.generate_response(prompt, template=template, prefix_cache=self.take_prefill(prompt))
+        except SchedulerBusyError:
+            # The model is saturated; fall back to the best bank question if it is relevant enough
+            if matches and matches[0][1] >= FALLBACK_MATCH_SCORE:
+                return self.serve_bank_question(matches[0][0], lookup_ms)
+            # Drop the unanswered turn so the candidate can resend it
+            self.conversation_history.pop()
+            self.schedule_prefill()
+            raise
         
         # Add interviewer's follow-up question to conversation history
-        self.conversation_history.append({"role": "interviewer", "content": response})
+        self.record_interviewer_turn(response)
+        self.schedule_prefill()
         return response
     
     def request_clarification(self, unclear_response):
@@ -211,10 +218,15 @@ class TechnicalInterviewer:
             unclear_response=unclear_response,
             topic=self.tech_stack
         )
-        response = self.generate_response(prompt)
+        try:
+            response = self.generate_response(prompt, template="clarification")
+        except SchedulerBusyError:
+            self.conversation_history.pop()
+            raise
         
         # Add interviewer's clarification request to conversation history
-        self.conversation_history.append({"role": "interviewer", "content": response})
+        self.record_interviewer_turn(response)
+        self.schedule_prefill()
         return response
     
     def handle_error(self, error_description):
@@ -226,37 +238,204 @@ class TechnicalInterviewer:
             error_description=error_description,
             tech_stack=self.tech_stack
         )
-        response = self.generate_response(prompt)
+        try:
+            response = self.generate_response(prompt, template="error_recovery")
+        except SchedulerBusyError:
+            self.conversation_history.pop()
+            raise
         
         # Add interviewer's error recovery response to conversation history
-        self.conversation_history.append({"role": "interviewer", "content": response})
+        self.record_interviewer_turn(response)
+        self.schedule_prefill()
         return response
     
     def conclude_interview(self):
+        # A retry after a failed evaluation keeps the conclusion already generated
+        if self.conclusion is not None:
+            return self.conclusion
+        self.evict_prefill()
         prompt = create_interview_conclusion_prompt(
             conversation_history=self.conversation_history,
             skill_level=f"{self.candidate_skill_level} with {self.years_of_experience}",
             tech_stack=self.tech_stack
         )
-        response = self.generate_response(prompt)
-        self.conversation_history.append({"role": "interviewer", "content": response})
+        response = self.generate_response(prompt, template="conclusion", priority=PRIORITY_BACKGROUND)
+        self.record_interviewer_turn(response)
+        self.conclusion = response
+        return response
+    
+    def generate_response(self, prompt, template, priority=PRIORITY_INTERACTIVE, prefix_cache=None):
+        stats = {"template": template}
+        if self.scheduler is None:
+            response = generate_response(self.model, self.tokenizer, prompt, prefix_cache=prefix_cache, stats=stats)
+        else:
+            response = self.scheduler.run(
+                priority,
+                generate_response,
+                model=self.model,
+                tokenizer=self.tokenizer,
+                prompt=prompt,
+                prefix_cache=prefix_cache,
+                stats=stats
+            )
+        self.last_generation = stats
         return response
     
-    def generate_response(self, prompt):
-        return generate_response(
-            model=self.model,
-            tokenizer=self.tokenizer,
-            prompt=prompt
+    def search_question_bank(self, candidate_response, k=3):
+        # Match on the answer alone; the questions already asked, including the
+        # one just answered, only serve to filter out rewordings of them
+        asked = [message["content"] for message in self.conversation_history if message["role"] == "interviewer"]
+        return self.question_bank.search(
+            candidate_response,
+            stack_key=self.stack_key,
+            skill_level=self.candidate_skill_level,
+            k=k,
+            exclude=asked
+        )
+    
+    def serve_bank_question(self, question, lookup_ms):
+        self.evict_prefill()
+        self.last_generation = {
+            "template": "question_bank",
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "latency_ms": lookup_ms
+        }
+        self.record_interviewer_turn(question)
+        self.schedule_prefill()
+        return question
+    
+    def record_interviewer_turn(self, response):
+        self.conversation_history.append({"role": "interviewer", "content": response, **self.last_generation})
+        # Score the question against the bank now so follow-up lookups only combine cached masks
+        if self.question_bank is not None:
+            self.question_bank.repeat_mask(response)
+    
+    def schedule_prefill(self):
+        # The static cache is reset per generation, so there is nothing to carry over
+        if self.prefill_store is None or uses_static_generation(self.model):
+            return
+        # Cancel the previous prefill; a running one is joined so it can't
+        # overwrite the new cache
+        with self._prefill_lock:
+            started = self._prefill_started
+            self._prefill_prefix = None
+        if started and self._prefill_thread is not None:
+            self._prefill_thread.join()
+        self._prefill_thread = None
+        self.prefill_store.discard(self.session_id)
+        # Evict other sessions' idle caches first; skip if memory is still tight
+        if not self.prefill_store.make_room():
+            return
+        # Prefill everything up to the candidate's answer while they are typing
+        prefix = create_follow_up_prompt_prefix(
+            conversation_history=self.conversation_history,
+            skill_level=f"{self.candidate_skill_level} with {self.years_of_experience}"
         )
+        with self._prefill_lock:
+            self._prefill_prefix = prefix
+            self._prefill_started = False
+        self._prefill_thread = threading.Thread(target=self._prefill_worker, args=(prefix,), daemon=True)
+        self._prefill_thread.start()
+    
+    def _prefill_worker(self, prefix):
+        # Speculative work never queues; it is skipped when no slot can be spared
+        try:
+            if self.scheduler is None:
+                self._run_prefill(prefix)
+            else:
+                self.scheduler.try_run(PRIORITY_SPECULATIVE, self._run_prefill, prefix)
+        except SchedulerBusyError:
+            pass
+    
+    def _run_prefill(self, prefix):
+        with self._prefill_lock:
+            # Cancelled before it started
+            if self._prefill_prefix != prefix:
+                return
+            self._prefill_started = True
+        try:
+            cache = prefill_prompt_prefix(self.model, self.tokenizer, prefix)
+        except Exception:
+            # Prefill is speculative; the follow-up will simply do a full prefill
+            return
+        with self._prefill_lock:
+            # Drop the result if the prefix was evicted or replaced meanwhile
+            if self._prefill_prefix == prefix:
+                self.prefill_store.put(self.session_id, cache)
+    
+    def take_prefill(self, prompt):
+        if self.prefill_store is None:
+            return None
+        with self._prefill_lock:
+            started = self._prefill_started
+            if not started:
+                # Not admitted yet; cancel rather than wait for it
+                self._prefill_prefix = None
+        # Wait for a running prefill; it is cheaper than starting over
+        if started and self._prefill_thread is not None:
+            self._prefill_thread.join()
+        self._prefill_thread = None
+        with self._prefill_lock:
+            self._prefill_prefix = None
+            self._prefill_started = False
+        cache = self.prefill_store.take(self.session_id)
+        if cache is None or not prompt.startswith(cache["prefix"]):
+            return None
+        return cache
+    
+    def evict_prefill(self):
+        with self._prefill_lock:
+            self._prefill_prefix = None
+        if self.prefill_store is not None:
+            self.prefill_store.discard(self.session_id)
     
     def evaluate_tech_stack_knowledge(self):
         prompt = create_tech_stack_evaluation_prompt(
             conversation_history=self.conversation_history,
             tech_stack=self.tech_stack
         )
-        response = self.generate_response(prompt)
+        response = self.generate_response(prompt, template="evaluation", priority=PRIORITY_BACKGROUND)
         return response
     
+# Add a technology picked from search results to its category's selection
+def add_technology(tech_id):
+    key = CATEGORY_WIDGET_KEYS[TECH_CATALOG.category(tech_id)]
+    selected = st.session_state.get(key, [])
+    if TECH_CATALOG.names[tech_id] not in selected:
+        st.session_state[key] = selected + [TECH_CATALOG.names[tech_id]]
+
+# End the interview: conclusion and evaluation are both kept in the chat.
+# Safe to retry when the evaluation is rejected, the conclusion is reused
+def end_interview(interviewer):
+    interviewer.conclude_interview()
+    # Append only the conclusion turn, with its generation stats; the chat
+    # also holds evaluations the interviewer's history doesn't have
+    conclusion_turn = interviewer.conversation_history[-1]
+    history = st.session_state.conversation_history
+    if not history or history[-1] is not conclusion_turn:
+        history.append(conclusion_turn)
+    add_evaluation(interviewer)
+
+def add_evaluation(interviewer):
+    evaluation = interviewer.evaluate_tech_stack_knowledge()
+    st.session_state.conversation_history.append({
+        "role": "evaluation",
+        "content": evaluation,
+        **interviewer.last_generation
+    })
+
+# Run an interviewer action behind a spinner; when the model queue is full,
+# show a warning and report failure so the caller doesn't rerun
+def run_interviewer_action(spinner_text, action, *args):
+    try:
+        with st.spinner(spinner_text):
+            action(*args)
+    except SchedulerBusyError as e:
+        st.warning(f"The interviewer is busy right now. {str(e)}")
+        return False
+    return True
+
 # Function to clear input fields
 def clear_input():
     st.session_state.user_input = ""
@@ -273,10 +452,15 @@ def main():
         st.header("⚙️ Configuration")
         
         if not st.session_state.model_loaded:
+            # Compiled static-cache decoding is slower than eager on CPU, so it is only offered on GPU
+            static_generation = torch.cuda.is_available() and st.checkbox(
+                "Static KV cache + torch.compile (experimental)",
+                help="Compiles the decode step at load time. Loading takes longer, generation has less per-token overhead"
+            )
             if st.button("Load Model"):
                 with st.spinner("Loading model... This may take a few minutes."):
                     try:
-                        model, tokenizer, device = load_model()
+                        model, tokenizer, device = load_model(static_generation)
                         st.session_state.model = model
                         st.session_state.tokenizer = tokenizer
                         st.session_state.device = device
@@ -311,55 +495,86 @@ def main():
             
             st.subheader("Tech Stack Selection")
             
-            selected_tech = {}
+            # Search by name or alias, e.g. "k8s" or "postgres"
+            tech_query = st.text_input("🔎 Search technologies", key="tech_search")
+            for tech_id in TECH_CATALOG.search(tech_query, limit=8):
+                st.button(
+                    f"➕ {TECH_CATALOG.names[tech_id]} ({TECH_CATALOG.category(tech_id)})",
+                    key=f"add_tech_{tech_id}",
+                    help=TECH_CATALOG.descriptions[tech_id] or None,
+                    on_click=add_technology,
+                    args=(tech_id,)
+                )
+            
+            selected_names = []
             
             # Create expandable sections for each category
-            for category, technologies in TECH_STACK_CATEGORIES.items():
+            for category in TECH_CATALOG.categories:
                 with st.expander(f"📚 {category}", expanded=False):
-                    selected_items = st.multiselect(
+                    selected_names.extend(st.multiselect(
                         f"Select {category}",
-                        options=list(technologies.keys()),
-                        key=f"select_{category.lower().replace(' ', '_')}"
-                    )
-                    selected_tech[category] = selected_items
+                        options=TECH_CATALOG.category_options(category),
+                        key=CATEGORY_WIDGET_KEYS[category]
+                    ))
+            
+            # The multiselects list technologies by category; keep the order they
+            # were picked in so the first pick is the primary technology
+            selected = set(selected_names)
+            selection_order = [name for name in st.session_state.selection_order if name in selected]
+            selection_order += [name for name in selected_names if name not in selection_order]
+            st.session_state.selection_order = selection_order
             
-            # Flatten selected technologies into a single list
-            tech_stack = []
-            for category, items in selected_tech.items():
-                tech_stack.extend(items)
+            # Compact, de-duplicated stack of catalog IDs
+            stack = TECH_CATALOG.normalize_stack(selection_order)
+            tech_stack = TECH_CATALOG.stack_names(stack)
             
             if len(tech_stack) > 0:
                 st.success(f"Selected technologies: {', '.join(tech_stack)}")
             else:
                 st.warning("Please select at least one technology")
             
+            use_question_bank = st.checkbox(
+                "Question bank retrieval",
+                help="Serve close matches from the curated question bank and use related questions to ground follow-ups"
+            )
+            
             start_button = st.button("Start Interview")
             if start_button and not st.session_state.interview_started and len(tech_stack) > 0:
+                # Free the previous interview's prefill before replacing it
+                if st.session_state.interviewer is not None:
+                    st.session_state.interviewer.evict_prefill()
                 st.session_state.interviewer = TechnicalInterviewer(
                     st.session_state.model, 
                     st.session_state.tokenizer, 
-                    st.session_state.device
+                    st.session_state.device,
+                    scheduler=get_scheduler(),
+                    question_bank=get_question_bank() if use_question_bank else None,
+                    prefill_store=get_prefill_store(st.session_state.device)
                 )
-                st.session_state.interviewer.set_candidate_context(skill_level, tech_stack, years_of_experience)
+                st.session_state.interviewer.set_candidate_context(skill_level, stack, years_of_experience)
                 
                 # Start the interview
-                with st.spinner("Starting interview..."):
-                    first_question = st.session_state.interviewer.start_interview()
-                st.session_state.conversation_history = st.session_state.interviewer.conversation_history.copy()
-                st.session_state.interview_started = True
-                st.experimental_rerun()
+                if run_interviewer_action("Starting interview...", st.session_state.interviewer.start_interview):
+                    st.session_state.conversation_history = st.session_state.interviewer.conversation_history.copy()
+                    st.session_state.interview_started = True
+                    st.experimental_rerun()
             
             if st.session_state.interview_started:
                 st.warning("Interview in progress")
                 if st.button("End Interview"):
-                    with st.spinner("Concluding interview..."):
-                        conclusion = st.session_state.interviewer.conclude_interview()
-                        st.session_state.conversation_history.append({"role": "interviewer", "content": conclusion})
-                        evaluation = st.session_state.interviewer.evaluate_tech_stack_knowledge()
-                        st.session_state.conversation_history.append({"role": "evaluation", "content": evaluation})
-                    st.session_state.interview_started = False
-                    st.success("Interview concluded!")
-                    st.experimental_rerun()
+                    if run_interviewer_action("Concluding interview...", end_interview, st.session_state.interviewer):
+                        get_transcript_exporter().add_interview(
+                            st.session_state.conversation_history,
+                            skill_level=st.session_state.interviewer.candidate_skill_level,
+                            tech_stack=st.session_state.interviewer.tech_stack
+                        )
+                        st.session_state.interview_started = False
+                        st.success("Interview concluded!")
+                        st.experimental_rerun()
+            
+            with st.expander("📈 Queue Metrics", expanded=False):
+                st.json(get_scheduler().stats())
+                st.json({"prefill_caches": get_prefill_store(st.session_state.device).stats()})
     
     # Main chat interface
     st.subheader("💬 Interview Chat")
@@ -393,11 +608,10 @@ def main():
             if st.button("Send"):
                 if user_input:
                     # Get follow-up question
-                    with st.spinner("Generating response..."):
-                        response = st.session_state.interviewer.ask_follow_up(user_input)
+                    if run_interviewer_action("Generating response...", st.session_state.interviewer.ask_follow_up, user_input):
                         st.session_state.conversation_history = st.session_state.interviewer.conversation_history.copy()
-                    clear_input()
-                    st.experimental_rerun()
+                        clear_input()
+                        st.experimental_rerun()
         
         # Special actions
         st.markdown("---")
@@ -408,28 +622,24 @@ def main():
             clarification_input = st.text_input("Unclear response:", key="clarification_input")
             if st.button("Request Clarification"):
                 if clarification_input:
-                    with st.spinner("Generating clarification request..."):
-                        response = st.session_state.interviewer.request_clarification(clarification_input)
+                    if run_interviewer_action("Generating clarification request...", st.session_state.interviewer.request_clarification, clarification_input):
                         st.session_state.conversation_history = st.session_state.interviewer.conversation_history.copy()
-                    clear_input()
-                    st.experimental_rerun()
+                        clear_input()
+                        st.experimental_rerun()
         
         with col4:
             error_input = st.text_input("Error description:", key="error_input")
             if st.button("Report Error"):
                 if error_input:
-                    with st.spinner("Generating error recovery response..."):
-                        response = st.session_state.interviewer.handle_error(error_input)
+                    if run_interviewer_action("Generating error recovery response...", st.session_state.interviewer.handle_error, error_input):
                         st.session_state.conversation_history = st.session_state.interviewer.conversation_history.copy()
-                    clear_input()
-                    st.experimental_rerun()
+                        clear_input()
+                        st.experimental_rerun()
         
         with col5:
             if st.button("Evaluate Tech Stack"):
-                with st.spinner("Evaluating tech stack knowledge..."):
-                    evaluation = st.session_state.interviewer.evaluate_tech_stack_knowledge()
-                    st.session_state.conversation_history.append({"role": "evaluation", "content": evaluation})
-                st.experimental_rerun()
+                if run_interviewer_action("Evaluating tech stack knowledge...", add_evaluation, st.session_state.interviewer):
+                    st.experimental_rerun()
     
     # Footer
     st.markdown("---")
@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import time
+import torch
+import pyarrow.dataset as ds
+from prompts import create_tech_stack_evaluation_prompt
+from output import DEFAULT_MODEL_NAME, generate_batch_responses, load_model_and_tokenizer
+from transcripts import PARTITIONING
+
+
+def read_transcripts(path):
+    """
+    Read stored interviews from a JSONL file or an exported Parquet dataset.
+
+    JSONL lines hold {"interview_id", "tech_stack", "conversation_history"}.
+    A directory is read as the dataset written by transcripts.TranscriptExporter.
+
+    Args:
+        path (str): JSONL file or transcript dataset directory
+
+    Returns:
+        list: Interviews as dicts with interview_id, tech_stack and conversation_history
+    """
+    if not os.path.isdir(path):
+        interviews = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    interviews.append(json.loads(line))
+        return interviews
+
+    dataset = ds.dataset(path, format="parquet", partitioning=PARTITIONING)
+    table = dataset.to_table(columns=["interview_id", "turn", "role", "content", "tech_stack"])
+    table = table.sort_by([("interview_id", "ascending"), ("turn", "ascending")])
+
+    interviews = {}
+    for row in table.to_pylist():
+        interview = interviews.setdefault(row["interview_id"], {
+            "interview_id": row["interview_id"],
+            "tech_stack": row["tech_stack"],
+            "conversation_history": []
+        })
+        interview["conversation_history"].append({"role": row["role"], "content": row["content"]})
+    return list(interviews.values())
+
+
+def read_completed_ids(output_path):
+    """
+    Collect interview ids already graded in a previous run.
+
+    Args:
+        output_path (str): JSONL results file
+
+    Returns:
+        set: Interview ids present in the file
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                completed.add(json.loads(line)["interview_id"])
+            except (json.JSONDecodeError, KeyError):
+                # A run killed mid-write can leave a truncated last line
+                continue
+    return completed
+
+
+def make_batches(jobs, tokenizer, batch_size):
+    """
+    Group evaluation jobs into batches of similar prompt length.
+
+    Args:
+        jobs (list): (interview_id, prompt) tuples
+        tokenizer: The tokenizer used to measure prompt length
+        batch_size (int): Maximum prompts per batch
+
+    Returns:
+        list: Batches of (interview_id, prompt) tuples, shortest first
+    """
+    lengths = [len(ids) for ids in tokenizer([prompt for _, prompt in jobs])["input_ids"]]
+    ordered = [job for _, job in sorted(zip(lengths, jobs), key=lambda item: item[0])]
+    return [ordered[i:i + batch_size] for i in range(0, len(ordered), batch_size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-evaluate stored interview transcripts in batches")
+    parser.add_argument("input", help="JSONL transcript file or exported transcript dataset directory")
+    parser.add_argument("output", help="JSONL file results are appended to; also used to resume")
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME, help="Model to grade with")
+    parser.add_argument("--device", default=None, help="Device to run on (cpu or cuda)")
+    parser.add_argument("--batch-size", type=int, default=8, help="Prompts per generate call")
+    parser.add_argument("--seed", type=int, default=0, help="Sampling seed")
+    args = parser.parse_args()
+
+    interviews = read_transcripts(args.input)
+    completed = read_completed_ids(args.output)
+    jobs = [
+        (interview["interview_id"], create_tech_stack_evaluation_prompt(
+            conversation_history=interview["conversation_history"],
+            tech_stack=interview["tech_stack"]
+        ))
+        for interview in interviews
+        if interview["interview_id"] not in completed
+    ]
+    print(f"{len(interviews)} interviews, {len(completed)} already graded, {len(jobs)} to go")
+    if not jobs:
+        return
+
+    model, tokenizer, _ = load_model_and_tokenizer(args.model, device=args.device)
+    torch.manual_seed(args.seed)
+
+    graded = 0
+    start_time = time.perf_counter()
+    with open(args.output, "a", encoding="utf-8") as out:
+        # Start on a fresh line if the previous run was cut off mid-write
+        if out.tell() > 0:
+            with open(args.output, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    out.write("\n")
+        for batch in make_batches(jobs, tokenizer, args.batch_size):
+            results = generate_batch_responses(model, tokenizer, [prompt for _, prompt in batch])
+            for (interview_id, _), (evaluation, prompt_tokens, completion_tokens) in zip(batch, results):
+                out.write(json.dumps({
+                    "interview_id": interview_id,
+                    "evaluation": evaluation,
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens
+                }) + "\n")
+            # Each finished batch is a checkpoint: a restart skips these ids
+            out.flush()
+            os.fsync(out.fileno())
+
+            graded += len(batch)
+            elapsed = time.perf_counter() - start_time
+            print(f"{graded}/{len(jobs)} graded, {graded / elapsed:.2f} interviews/s")
+
+
+if __name__ == "__main__":
+    main()
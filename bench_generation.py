@@ -0,0 +1,112 @@
+import argparse
+import statistics
+import torch
+from prompts import (
+    create_technical_question_prompt,
+    create_follow_up_prompt,
+    create_clarification_prompt,
+    create_error_recovery_prompt,
+    create_interview_conclusion_prompt,
+    create_tech_stack_evaluation_prompt
+)
+from output import (
+    DEFAULT_MODEL_NAME,
+    generate_response,
+    load_model_and_tokenizer,
+    enable_static_generation
+)
+
+SKILL_LEVEL = "intermediate with 3-5 years (Mid-Level)"
+TECH_STACK = ["Python", "Django", "PostgreSQL", "Redis", "Docker"]
+
+SAMPLE_HISTORY = [
+    {"role": "interviewer", "content": "Your Django app is getting slow list pages backed by PostgreSQL. How would you find and fix the problem?"},
+    {"role": "candidate", "content": "I would start with django-debug-toolbar to count queries per request, look for N+1 patterns and fix them with select_related and prefetch_related. Then I would run EXPLAIN ANALYZE on the slowest queries and add indexes where sequential scans show up."},
+    {"role": "interviewer", "content": "Good. How would you add caching with Redis without serving stale data?"},
+    {"role": "candidate", "content": "Cache the rendered fragments keyed by object id and version, and bump the version in a post_save signal so readers miss the cache after a write. For lists I would use a short TTL."},
+    {"role": "interviewer", "content": "How would you deploy this with Docker so migrations don't cause downtime?"},
+    {"role": "candidate", "content": "Run migrations as a separate one-off container before rolling out new app containers, and keep migrations backwards compatible by splitting column removals into two releases."}
+]
+
+
+def build_prompts():
+    """
+    Build one prompt per template type from a representative interview.
+
+    Returns:
+        dict: Prompt text keyed by template name
+    """
+    return {
+        "technical_question": create_technical_question_prompt(SKILL_LEVEL, TECH_STACK),
+        "follow_up": create_follow_up_prompt(SAMPLE_HISTORY, SAMPLE_HISTORY[-1]["content"], SKILL_LEVEL),
+        "clarification": create_clarification_prompt("idk maybe cache it?", TECH_STACK),
+        "error_recovery": create_error_recovery_prompt("Redis persists every write to disk synchronously by default", TECH_STACK),
+        "conclusion": create_interview_conclusion_prompt(SAMPLE_HISTORY, SKILL_LEVEL, TECH_STACK),
+        "evaluation": create_tech_stack_evaluation_prompt(SAMPLE_HISTORY, TECH_STACK)
+    }
+
+
+def run_benchmark(model, tokenizer, prompts, runs, seed):
+    """
+    Time generate_response on each prompt.
+
+    Args:
+        model: The language model to generate responses.
+        tokenizer: The tokenizer to encode and decode text.
+        prompts (dict): Prompt text keyed by template name
+        runs (int): Number of timed generations per prompt
+        seed (int): Seed reset before every run so sampling is comparable
+
+    Returns:
+        dict: Per-template prompt tokens, median latency and median ms per generated token
+    """
+    results = {}
+    for name, prompt in prompts.items():
+        latencies = []
+        per_token = []
+        for _ in range(runs):
+            torch.manual_seed(seed)
+            stats = {}
+            generate_response(model, tokenizer, prompt, stats=stats)
+            latencies.append(stats["latency_ms"])
+            per_token.append(stats["latency_ms"] / max(stats["completion_tokens"], 1))
+        results[name] = {
+            "prompt_tokens": stats["prompt_tokens"],
+            "latency_ms": statistics.median(latencies),
+            "ms_per_token": statistics.median(per_token)
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare eager and static-cache compiled generation")
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME, help="Model to benchmark")
+    parser.add_argument("--device", default="cpu", help="Device to run on (cpu or cuda)")
+    parser.add_argument("--runs", type=int, default=3, help="Timed generations per prompt and mode")
+    parser.add_argument("--seed", type=int, default=0, help="Sampling seed")
+    args = parser.parse_args()
+
+    model, tokenizer, _ = load_model_and_tokenizer(args.model, device=args.device)
+    prompts = build_prompts()
+
+    eager = run_benchmark(model, tokenizer, prompts, args.runs, args.seed)
+    if not enable_static_generation(model, tokenizer):
+        print(f"{args.model} doesn't support a static KV cache; only eager results are available")
+        static = {}
+    else:
+        static = run_benchmark(model, tokenizer, prompts, args.runs, args.seed)
+
+    print("template\tprompt_tokens\teager_ms\teager_ms_per_token\tstatic_ms\tstatic_ms_per_token\tspeedup")
+    for name, result in eager.items():
+        row = [name, str(result["prompt_tokens"]), f"{result['latency_ms']:.0f}", f"{result['ms_per_token']:.1f}"]
+        if name in static:
+            row += [
+                f"{static[name]['latency_ms']:.0f}",
+                f"{static[name]['ms_per_token']:.1f}",
+                f"{result['ms_per_token'] / static[name]['ms_per_token']:.2f}x"
+            ]
+        print("\t".join(row))
+
+
+if __name__ == "__main__":
+    main()
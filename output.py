@@ -1,7 +1,332 @@
+import contextlib
+import os
+import queue
+import threading
+import time
 import torch
 import re
+from collections import OrderedDict
+from transformers import AutoModelForCausalLM, AutoTokenizer, StaticCache
 
-def generate_response(model, tokenizer, prompt):
+DEFAULT_MODEL_NAME = "microsoft/Phi-3-mini-4k-instruct"
+
+# Fraction of free memory below which cached prefill state is dropped
+MIN_FREE_MEMORY_FRACTION = 0.1
+
+# Combined size of all sessions' speculative prefill caches; at fp32 Phi-3
+# mini's cache is about 0.75 MB per token, so this holds a handful of sessions
+PREFILL_CACHE_BUDGET_BYTES = 512 * 1024 * 1024
+
+MAX_NEW_TOKENS = 512
+
+# Static generation: the KV cache covers the model's 4k context window
+STATIC_CACHE_LENGTH = 4096
+
+def load_model_and_tokenizer(model_name=DEFAULT_MODEL_NAME, device=None):
+    """
+    Load the language model and its tokenizer.
+    
+    Args:
+        model_name (str): Hugging Face model id to load.
+        device (str, optional): "cuda" or "cpu". Defaults to GPU when available.
+    
+    Returns:
+        tuple: (model, tokenizer, device)
+    """
+    if device is None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+    
+    # Load model with specific device configuration
+    model = AutoModelForCausalLM.from_pretrained(
+        model_name,
+        torch_dtype=torch.float16 if device == "cuda" else torch.float32,
+        low_cpu_mem_usage=True,
+        device_map="auto" if device == "cuda" else None  # Fixed device map setting
+    )
+    
+    tokenizer = AutoTokenizer.from_pretrained(
+        model_name,
+        use_fast=True
+    )
+    
+    # Ensure we have a pad token
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    
+    return model, tokenizer, device
+
+
+def enable_static_generation(model, tokenizer, num_caches=1, warmup=True):
+    """
+    Compile the model's decode step and pre-allocate static KV caches for it.
+    
+    Only single-token decode steps on a static cache go through the compiled
+    graph, since their shapes never change. Prefill, prefix prefill and
+    prompts too long for the cache call the original eager forward. One
+    cache is allocated per concurrent generation, so sessions never wait on
+    each other for a cache.
+    
+    Measured with bench_generation.py on CPU, the compiled path is about 1.5x
+    slower than eager (attention runs over all STATIC_CACHE_LENGTH slots), so
+    this is only worth enabling on GPU.
+    
+    Args:
+        model: The language model to generate responses.
+        tokenizer: The tokenizer to encode text.
+        num_caches (int): Number of generations that may run at once.
+        warmup (bool): Whether to compile right away instead of on the first turn.
+    
+    Returns:
+        bool: False if the model can't be compiled and stays eager.
+    """
+    if not (getattr(model, "_can_compile_fullgraph", False) or getattr(model, "_supports_static_cache", False)):
+        return False
+    
+    device = next(model.parameters()).device
+    eager_forward = model.forward
+    compiled_forward = torch.compile(eager_forward, fullgraph=True)
+    
+    def forward(*args, **kwargs):
+        input_ids = kwargs.get("input_ids")
+        if (isinstance(kwargs.get("past_key_values"), StaticCache)
+                and input_ids is not None and input_ids.shape[1] == 1):
+            return compiled_forward(*args, **kwargs)
+        return eager_forward(*args, **kwargs)
+    
+    model.forward = forward
+    # generate() would otherwise compile the decode step a second time on GPU
+    model.generation_config.disable_compile = True
+    
+    caches = queue.Queue()
+    for _ in range(num_caches):
+        caches.put(StaticCache(config=model.config, max_cache_len=STATIC_CACHE_LENGTH))
+    model.static_generation = {"caches": caches, "eager_forward": eager_forward}
+    
+    if warmup:
+        inputs = {k: v.to(device) for k, v in tokenizer("Warm-up", return_tensors="pt").items()}
+        for _ in range(num_caches):
+            with static_cache(model) as cache, torch.no_grad():
+                model.generate(
+                    **inputs,
+                    past_key_values=cache,
+                    max_new_tokens=3,
+                    do_sample=False,
+                    pad_token_id=tokenizer.pad_token_id
+                )
+    
+    return True
+
+
+def uses_static_generation(model):
+    """
+    Check whether enable_static_generation has been applied to the model.
+    
+    Args:
+        model: The language model.
+    
+    Returns:
+        bool: True if generations go through the static KV cache.
+    """
+    return getattr(model, "static_generation", None) is not None
+
+
+@contextlib.contextmanager
+def static_cache(model):
+    """
+    Borrow one of the model's static KV caches, reset and ready for a new generation.
+    
+    Args:
+        model: A model prepared with enable_static_generation.
+    
+    Yields:
+        StaticCache: The borrowed cache, returned to the pool on exit.
+    """
+    caches = model.static_generation["caches"]
+    cache = caches.get()
+    try:
+        cache.reset()
+        yield cache
+    finally:
+        caches.put(cache)
+
+
+def prefill_prompt_prefix(model, tokenizer, prefix):
+    """
+    Run the model over a known prompt prefix and keep its KV cache.
+    
+    Args:
+        model: The language model to prefill.
+        tokenizer: The tokenizer to encode text.
+        prefix (str): The leading part of a prompt that is already known.
+    
+    Returns:
+        dict: The prefix text, its input ids and the resulting past_key_values.
+    """
+    device = next(model.parameters()).device
+    input_ids = tokenizer(prefix, return_tensors="pt")["input_ids"].to(device)
+    
+    # A compiled model's dynamic-cache calls are eager already; call the
+    # original forward directly so this never touches the compiled graph
+    static_state = getattr(model, "static_generation", None)
+    forward = static_state["eager_forward"] if static_state is not None else model
+    with torch.no_grad():
+        outputs = forward(input_ids=input_ids, use_cache=True)
+    
+    return {
+        "prefix": prefix,
+        "input_ids": input_ids,
+        "past_key_values": outputs.past_key_values,
+        "size_bytes": input_ids.shape[1] * kv_cache_bytes_per_token(model)
+    }
+
+
+def kv_cache_bytes_per_token(model):
+    """
+    Estimate the KV cache size of one token from the model config.
+    
+    Args:
+        model: The language model.
+    
+    Returns:
+        int: Bytes of keys and values stored per token across all layers.
+    """
+    config = model.config
+    head_dim = getattr(config, "head_dim", None) or config.hidden_size // config.num_attention_heads
+    kv_heads = getattr(config, "num_key_value_heads", None) or config.num_attention_heads
+    element_size = torch.tensor([], dtype=model.dtype).element_size()
+    return 2 * config.num_hidden_layers * kv_heads * head_dim * element_size
+
+
+def is_memory_constrained(device):
+    """
+    Check whether free memory on the given device has dropped below
+    MIN_FREE_MEMORY_FRACTION.
+    
+    Args:
+        device (str): "cuda" or "cpu".
+    
+    Returns:
+        bool: True if cached state should be evicted to relieve memory.
+    """
+    try:
+        if device == "cuda":
+            free, total = torch.cuda.mem_get_info()
+        else:
+            free, total = _available_system_memory()
+    except (AttributeError, ValueError, KeyError, OSError, RuntimeError):
+        # Platform doesn't expose memory stats; assume there is headroom
+        return False
+    
+    return total > 0 and free / total < MIN_FREE_MEMORY_FRACTION
+
+
+def _available_system_memory():
+    # MemAvailable counts page cache the kernel can reclaim, e.g. the model
+    # weights just read from disk; SC_AVPHYS_PAGES only counts unused pages
+    # and stays low on any machine that has been running for a while
+    if os.path.exists("/proc/meminfo"):
+        meminfo = {}
+        with open("/proc/meminfo") as f:
+            for line in f:
+                name, value = line.split(":", 1)
+                meminfo[name] = int(value.split()[0]) * 1024
+        return meminfo["MemAvailable"], meminfo["MemTotal"]
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    return os.sysconf("SC_AVPHYS_PAGES") * page_size, os.sysconf("SC_PHYS_PAGES") * page_size
+
+
+class PrefillCacheStore:
+    """
+    Process-wide store of speculative prefill caches, at most one per session.
+    
+    Caches are kept in the order they were stored and the oldest are evicted
+    whenever their combined size exceeds the byte budget or free memory drops
+    below MIN_FREE_MEMORY_FRACTION. A cache is removed when it is taken, so
+    generate_response can extend it in place.
+    """
+    
+    def __init__(self, device, max_bytes=PREFILL_CACHE_BUDGET_BYTES):
+        """
+        Args:
+            device (str): "cuda" or "cpu", checked for memory pressure.
+            max_bytes (int): Budget for all stored caches together.
+        """
+        self.device = device
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._caches = OrderedDict()
+        self._total_bytes = 0
+    
+    def put(self, owner, cache):
+        """
+        Store a cache for an owner, replacing its previous one, then evict
+        down to the budget. The new cache itself may be evicted.
+        
+        Args:
+            owner (str): Session the cache belongs to.
+            cache (dict): Result of prefill_prompt_prefix.
+        """
+        with self._lock:
+            self._pop_locked(owner)
+            self._caches[owner] = cache
+            self._total_bytes += cache["size_bytes"]
+            self._evict_locked()
+    
+    def take(self, owner):
+        """
+        Remove and return an owner's cache.
+        
+        Args:
+            owner (str): Session the cache belongs to.
+        
+        Returns:
+            dict: The stored cache, or None if there is none.
+        """
+        with self._lock:
+            return self._pop_locked(owner)
+    
+    def discard(self, owner):
+        """
+        Drop an owner's cache if there is one.
+        
+        Args:
+            owner (str): Session the cache belongs to.
+        """
+        with self._lock:
+            self._pop_locked(owner)
+    
+    def make_room(self):
+        """
+        Evict caches until the store is within budget and memory isn't constrained.
+        
+        Returns:
+            bool: True if there is room for another prefill.
+        """
+        with self._lock:
+            self._evict_locked()
+            return not is_memory_constrained(self.device)
+    
+    def stats(self):
+        """
+        Returns:
+            dict: Number of stored caches and their combined size in bytes.
+        """
+        with self._lock:
+            return {"caches": len(self._caches), "bytes": self._total_bytes}
+    
+    def _pop_locked(self, owner):
+        cache = self._caches.pop(owner, None)
+        if cache is not None:
+            self._total_bytes -= cache["size_bytes"]
+        return cache
+    
+    def _evict_locked(self):
+        while self._caches and (self._total_bytes > self.max_bytes or is_memory_constrained(self.device)):
+            _, cache = self._caches.popitem(last=False)
+            self._total_bytes -= cache["size_bytes"]
+
+
+def generate_response(model, tokenizer, prompt, prefix_cache=None, stats=None):
     """
     Generate an interviewer response from the model based on the given prompt.
     
@@ -9,6 +334,12 @@ def generate_response(model, tokenizer, prompt):
         model: The language model to generate responses.
         tokenizer: The tokenizer to encode and decode text.
         prompt (str): The input prompt for the model.
+        prefix_cache (dict, optional): Result of prefill_prompt_prefix for a
+            prefix of `prompt`. Only the remaining tokens are prefilled.
+            The cache is extended in place and can't be reused afterwards.
+            Ignored when the model uses static generation.
+        stats (dict, optional): If given, filled with prompt_tokens,
+            completion_tokens and latency_ms for this generation.
     
     Returns:
         str: The generated response from the model.
@@ -18,13 +349,33 @@ def generate_response(model, tokenizer, prompt):
     
     # Encode the prompt and move to the same device as the model
     inputs = tokenizer(prompt, return_tensors="pt")
+    prompt_tokens = inputs["input_ids"].shape[1]
     inputs = {k: v.to(device) for k, v in inputs.items()}
     
+    # Prompts too long to leave room for MAX_NEW_TOKENS in the static cache
+    # run eagerly with a dynamic cache
+    use_static = uses_static_generation(model) and prompt_tokens + MAX_NEW_TOKENS <= STATIC_CACHE_LENGTH
+    
+    # Reuse the prefilled KV state only if the prompt tokenizes to the same
+    # leading ids; otherwise fall back to a full prefill
+    generate_kwargs = {}
+    if not use_static and prefix_cache is not None and prompt.startswith(prefix_cache["prefix"]):
+        cached_ids = prefix_cache["input_ids"]
+        prefix_len = cached_ids.shape[1]
+        if (inputs["input_ids"].shape[1] > prefix_len
+                and torch.equal(inputs["input_ids"][:, :prefix_len], cached_ids)):
+            generate_kwargs["past_key_values"] = prefix_cache["past_key_values"]
+    
     # Generate output
-    with torch.no_grad():  # More memory efficient for inference
+    start_time = time.perf_counter()
+    cache_context = static_cache(model) if use_static else contextlib.nullcontext()
+    with cache_context as cache, torch.no_grad():  # More memory efficient for inference
+        if cache is not None:
+            generate_kwargs["past_key_values"] = cache
         outputs = model.generate(
             **inputs, 
-            max_new_tokens=512,  # Increased from 256 for more context
+            **generate_kwargs,
+            max_new_tokens=MAX_NEW_TOKENS,  # Increased from 256 for more context
             do_sample=True, 
             temperature=0.7,
             top_p=0.9,  # Added nucleus sampling
@@ -33,6 +384,11 @@ def generate_response(model, tokenizer, prompt):
             eos_token_id=tokenizer.eos_token_id
         )
     
+    if stats is not None:
+        stats["prompt_tokens"] = prompt_tokens
+        stats["completion_tokens"] = outputs.shape[1] - inputs["input_ids"].shape[1]
+        stats["latency_ms"] = (time.perf_counter() - start_time) * 1000
+    
     # Decode the output
     decoded = tokenizer.decode(outputs[0], skip_special_tokens=True)
     
@@ -56,6 +412,19 @@ def generate_response(model, tokenizer, prompt):
                 # Just use the entire output if nothing else works
                 response = decoded.strip()
     
+    return clean_response(response)
+
+
+def clean_response(response):
+    """
+    Normalize whitespace in a generated response and replace empty output.
+    
+    Args:
+        response (str): Raw response text extracted from the model output.
+    
+    Returns:
+        str: The cleaned response.
+    """
     # Clean up the response
     response = re.sub(r'\n{3,}', '\n\n', response)
     response = re.sub(r'\s{3,}', ' ', response)
@@ -65,4 +434,57 @@ def generate_response(model, tokenizer, prompt):
         # Fallback response if model output is too short or empty
         response = "Could you please elaborate on your previous answer? I'd like to understand your approach better."
     
-    return response
\ No newline at end of file
+    return response
+
+
+def generate_batch_responses(model, tokenizer, prompts):
+    """
+    Generate responses for several prompts in one padded batch.
+    
+    Prompts are left-padded to the longest one, so batches of similar
+    length waste the least compute.
+    
+    Args:
+        model: The language model to generate responses.
+        tokenizer: The tokenizer to encode and decode text.
+        prompts (list): Input prompts for the model.
+    
+    Returns:
+        list: (response, prompt_tokens, completion_tokens) tuples in prompt order.
+    """
+    device = next(model.parameters()).device
+    
+    padding_side = tokenizer.padding_side
+    tokenizer.padding_side = "left"
+    try:
+        inputs = tokenizer(prompts, return_tensors="pt", padding=True)
+    finally:
+        tokenizer.padding_side = padding_side
+    inputs = {k: v.to(device) for k, v in inputs.items()}
+    
+    with torch.no_grad():
+        outputs = model.generate(
+            **inputs,
+            max_new_tokens=MAX_NEW_TOKENS,
+            do_sample=True,
+            temperature=0.7,
+            top_p=0.9,
+            repetition_penalty=1.2,
+            pad_token_id=tokenizer.pad_token_id,
+            eos_token_id=tokenizer.eos_token_id
+        )
+    
+    # Everything after the padded prompt is newly generated. A sequence ends
+    # at its first EOS and is padded after that; Phi-3's pad token is its EOS,
+    # so count up to and including the first EOS rather than non-pad tokens
+    generated_ids = outputs[:, inputs["input_ids"].shape[1]:]
+    is_eos = generated_ids == tokenizer.eos_token_id
+    completion_lengths = torch.where(is_eos.any(dim=1), is_eos.int().argmax(dim=1) + 1, generated_ids.shape[1])
+    results = []
+    for i, generated in enumerate(generated_ids):
+        prompt_tokens = int(inputs["attention_mask"][i].sum())
+        completion_tokens = int(completion_lengths[i])
+        response = tokenizer.decode(generated, skip_special_tokens=True).strip()
+        results.append((clean_response(response), prompt_tokens, completion_tokens))
+    
+    return results
\ No newline at end of file
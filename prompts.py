@@ -69,17 +69,20 @@ Generate your question now:"""
     return prompt
 
 
-def create_follow_up_prompt(conversation_history, candidate_response, skill_level):
+def create_follow_up_prompt_prefix(conversation_history, skill_level):
     """
-    Create a prompt template for generating follow-up responses based on candidate's answer.
+    Create the part of the follow-up prompt that precedes the candidate's answer.
+    
+    Everything up to the `Candidate's Response:` slot is known as soon as the
+    interviewer has asked a question, so it can be prefilled while the
+    candidate is still typing.
     
     Args:
         conversation_history (list): List of previous messages in the conversation
-        candidate_response (str): Candidate's latest answer
         skill_level (str): Skill level with years of experience
         
     Returns:
-        str: Formatted prompt for generating follow-up
+        str: Prompt text ending right before the candidate's answer
     """
     # Extract the last question from conversation history
     last_question = None
@@ -88,6 +91,28 @@ def create_follow_up_prompt(conversation_history, candidate_response, skill_leve
             last_question = message["content"]
             break
     
+    return f"""You are an expert technical interviewer reviewing a candidate's response. Respond appropriately based on the quality and content of their answer.
+
+Candidate Skill Level: {skill_level}
+Previous Question: {last_question}
+Candidate's Response:"""
+
+
+def create_follow_up_prompt(conversation_history, candidate_response, skill_level, reference_questions=None):
+    """
+    Create a prompt template for generating follow-up responses based on candidate's answer.
+    
+    Args:
+        conversation_history (list): List of previous messages in the conversation
+        candidate_response (str): Candidate's latest answer
+        skill_level (str): Skill level with years of experience
+        reference_questions (list, optional): Related questions from the question bank to ground the follow-up
+        
+    Returns:
+        str: Formatted prompt for generating follow-up
+    """
+    prefix = create_follow_up_prompt_prefix(conversation_history, skill_level)
+    
     # Extract tech stack from conversation
     tech_stack = []
     for message in conversation_history:
@@ -96,13 +121,16 @@ def create_follow_up_prompt(conversation_history, candidate_response, skill_leve
             tech_stack = [tech.strip() for tech in tech_context.split(',')]
             break
     
-    prompt = f"""You are an expert technical interviewer reviewing a candidate's response. Respond appropriately based on the quality and content of their answer.
-
-Candidate Skill Level: {skill_level}
-Previous Question: {last_question}
-Candidate's Response: {candidate_response}
+    # Related bank questions go after the candidate's answer so the prefix stays cacheable
+    references = ""
+    if reference_questions:
+        references = "Related Questions (use as inspiration, do not copy verbatim):\n" + "\n".join(
+            f"- {question}" for question in reference_questions
+        ) + "\n"
+    
+    prompt = f"""{prefix} {candidate_response}
 Tech Stack: {', '.join(tech_stack) if tech_stack else 'Not specified'}
-
+{references}
 Analyze the candidate's response and choose the most appropriate response type:
 
 If the response is NONSENSICAL or COMPLETELY IRRELEVANT (e.g., random characters, off-topic, or unintelligible):
@@ -195,6 +223,8 @@ def create_interview_conclusion_prompt(conversation_history, skill_level, tech_s
     
     # Get the last 3 responses for context
     recent_responses = candidate_responses[-3:] if len(candidate_responses) >= 3 else candidate_responses
+    # Joined outside the f-string, which can't contain a backslash before Python 3.12
+    recent_responses_text = "\n\n".join(recent_responses)
     
     prompt = f"""You are an expert technical interviewer concluding an interview session. Generate a professional and encouraging conclusion.
 
@@ -203,7 +233,7 @@ Interview Context:
 - Technologies Covered: {', '.join(tech_stack)}
 
 Some of the candidate's recent responses:
-{"\n\n".join(recent_responses)}
+{recent_responses_text}
 
 Create a conclusion that:
 1. Thanks the candidate for their time and thoughtful responses
@@ -0,0 +1,284 @@
+import json
+import math
+import os
+import re
+import numpy as np
+
+# Skill levels as used by the app, in increasing order
+SKILL_LEVELS = ["entry", "junior", "intermediate", "senior", "lead", "expert"]
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# A bank question is served as-is when it scores at least this fraction of
+# its own self-match score
+DIRECT_MATCH_SCORE = 0.6
+
+# Bank questions scoring at least this against a question that was already
+# asked are treated as rewordings of it and never returned
+REPEAT_MATCH_SCORE = 0.5
+
+# Minimum score for serving a bank question when the model is too busy to
+# generate a follow-up
+FALLBACK_MATCH_SCORE = 0.25
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "can", "do", "does", "for",
+    "from", "how", "i", "if", "in", "into", "is", "it", "its", "of", "on", "or", "so",
+    "that", "the", "their", "then", "there", "these", "this", "to", "was", "we", "what",
+    "when", "which", "while", "who", "why", "will", "with", "would", "you", "your"
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Distinct (stack, skill level) filters kept per QuestionBank
+MAX_CACHED_FILTERS = 1024
+
+# Asked questions whose repeat masks are kept per QuestionBank
+MAX_CACHED_REPEAT_MASKS = 4096
+
+_ARRAY_NAMES = ["postings_offsets", "postings_docs", "postings_tf", "doc_lengths", "doc_self_scores", "doc_tech", "doc_levels"]
+
+
+def tokenize(text):
+    """
+    Split text into lowercase index terms, dropping stopwords.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list: Index terms in order of appearance
+    """
+    return [term for term in _TOKEN_PATTERN.findall(text.lower()) if term not in STOPWORDS]
+
+
+def _bm25_term_weights(tf, doc_lengths, idf, avg_doc_length):
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / avg_doc_length)
+    return idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+
+def build_index(bank_path, index_dir):
+    """
+    Build an inverted index over a question bank and write it to disk.
+
+    The bank is a JSON list of {"technology", "levels", "question"} entries.
+    Postings and per-document statistics are stored as .npy arrays so they
+    can be memory-mapped at load time; vocabulary and question text go to
+    meta.json.
+
+    Args:
+        bank_path (str): Path to the question bank JSON file
+        index_dir (str): Directory to write the index to
+    """
+    with open(bank_path, encoding="utf-8") as f:
+        bank = json.load(f)
+
+    technologies = sorted({entry["technology"] for entry in bank})
+    tech_ids = {tech: i for i, tech in enumerate(technologies)}
+
+    # term -> list of (doc id, term frequency)
+    postings = {}
+    doc_lengths = np.zeros(len(bank), dtype=np.float32)
+    doc_tech = np.zeros(len(bank), dtype=np.int32)
+    doc_levels = np.zeros(len(bank), dtype=np.uint8)
+    for doc_id, entry in enumerate(bank):
+        terms = tokenize(f"{entry['technology']} {entry['question']}")
+        doc_lengths[doc_id] = len(terms)
+        doc_tech[doc_id] = tech_ids[entry["technology"]]
+        for level in entry["levels"]:
+            doc_levels[doc_id] |= 1 << SKILL_LEVELS.index(level)
+        counts = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, count in counts.items():
+            postings.setdefault(term, []).append((doc_id, count))
+
+    vocabulary = sorted(postings)
+    offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    docs = []
+    tfs = []
+    for i, term in enumerate(vocabulary):
+        for doc_id, count in postings[term]:
+            docs.append(doc_id)
+            tfs.append(count)
+        offsets[i + 1] = len(docs)
+    postings_docs = np.array(docs, dtype=np.int32)
+    postings_tf = np.array(tfs, dtype=np.float32)
+
+    # Score of each question against its own terms, used to normalize matches
+    avg_doc_length = float(doc_lengths.mean()) if len(bank) else 1.0
+    doc_self_scores = np.zeros(len(bank), dtype=np.float32)
+    for i, term in enumerate(vocabulary):
+        start, end = offsets[i], offsets[i + 1]
+        idf = math.log(1 + (len(bank) - (end - start) + 0.5) / ((end - start) + 0.5))
+        term_docs = postings_docs[start:end]
+        doc_self_scores[term_docs] += _bm25_term_weights(postings_tf[start:end], doc_lengths[term_docs], idf, avg_doc_length)
+
+    os.makedirs(index_dir, exist_ok=True)
+    arrays = {
+        "postings_offsets": offsets,
+        "postings_docs": postings_docs,
+        "postings_tf": postings_tf,
+        "doc_lengths": doc_lengths,
+        "doc_self_scores": doc_self_scores,
+        "doc_tech": doc_tech,
+        "doc_levels": doc_levels
+    }
+    for name in _ARRAY_NAMES:
+        np.save(os.path.join(index_dir, f"{name}.npy"), arrays[name])
+
+    source_stat = os.stat(bank_path)
+    meta = {
+        "source_mtime_ns": source_stat.st_mtime_ns,
+        "source_size": source_stat.st_size,
+        "avg_doc_length": avg_doc_length,
+        "technologies": technologies,
+        "vocabulary": vocabulary,
+        "questions": [entry["question"] for entry in bank]
+    }
+    with open(os.path.join(index_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+class QuestionBank:
+    """
+    BM25 retrieval over a prebuilt question bank index.
+
+    Array data is memory-mapped, so loading costs little more than reading
+    the vocabulary, and pages are only touched for the terms queried.
+    Technologies are addressed by their tech_catalog IDs.
+    """
+
+    def __init__(self, index_dir, catalog):
+        """
+        Args:
+            index_dir (str): Directory written by build_index
+            catalog (TechCatalog): Catalog the bank's technology names are resolved against
+        """
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.avg_doc_length = meta["avg_doc_length"]
+        self.questions = meta["questions"]
+        # Catalog ID -> index technology ID; bank technologies missing from the catalog are never matched
+        self.technology_ids = {}
+        for i, tech in enumerate(meta["technologies"]):
+            catalog_id = catalog.lookup(tech)
+            if catalog_id is not None:
+                self.technology_ids[catalog_id] = i
+        self.term_ids = {term: i for i, term in enumerate(meta["vocabulary"])}
+        for name in _ARRAY_NAMES:
+            setattr(self, name, np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r"))
+        # Stacks repeat across turns and sessions, so filters are cached per instance
+        self._allowed_masks = {}
+        self._repeat_masks = {}
+
+    def search(self, query, stack_key, skill_level, k=3, exclude=()):
+        """
+        Rank bank questions for the given technologies and level against a query.
+
+        Args:
+            query (str): Text to match, e.g. the candidate's answer
+            stack_key (tuple): Catalog IDs to restrict results to, from TechCatalog.stack_key
+            skill_level (str): One of SKILL_LEVELS
+            k (int): Maximum number of results
+            exclude (iterable): Questions already asked. Bank questions scoring
+                REPEAT_MATCH_SCORE or more against any of them are dropped,
+                so rewordings are excluded along with exact repeats. See
+                repeat_mask for precomputing this when a question is asked.
+
+        Returns:
+            list: (question, score) tuples, best first. Scores are normalized
+                by each question's self-match score, so 1.0 means every term
+                of the question appears in the query.
+        """
+        allowed = self._allowed_mask(stack_key, skill_level)
+        if allowed is None:
+            return []
+        scores = np.where(allowed, self._match_scores(query), 0)
+        for question in exclude:
+            scores[self.repeat_mask(question)] = 0
+
+        candidates = np.flatnonzero(scores)
+        top = candidates[np.argsort(-scores[candidates], kind="stable")][:k]
+        return [(self.questions[doc_id], float(scores[doc_id])) for doc_id in top]
+
+    def repeat_mask(self, question):
+        """
+        Mark the bank questions that repeat or reword an asked question.
+
+        The mask depends only on the question text, so it is computed once
+        and cached; calling this when a question is asked keeps later
+        searches from re-scoring it.
+
+        Args:
+            question (str): A question put to the candidate
+
+        Returns:
+            numpy.ndarray: Boolean mask over bank questions
+        """
+        mask = self._repeat_masks.get(question)
+        if mask is None:
+            mask = self._match_scores(question) >= REPEAT_MATCH_SCORE
+            if len(self._repeat_masks) >= MAX_CACHED_REPEAT_MASKS:
+                self._repeat_masks.clear()
+            self._repeat_masks[question] = mask
+        return mask
+
+    def _match_scores(self, text):
+        # BM25 score of every bank question against the text, normalized by
+        # the question's self-match score
+        n_docs = len(self.questions)
+        scores = np.zeros(n_docs, dtype=np.float32)
+        for term in set(tokenize(text)):
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            start, end = self.postings_offsets[term_id], self.postings_offsets[term_id + 1]
+            idf = math.log(1 + (n_docs - (end - start) + 0.5) / ((end - start) + 0.5))
+            docs = self.postings_docs[start:end]
+            scores[docs] += _bm25_term_weights(self.postings_tf[start:end], self.doc_lengths[docs], idf, self.avg_doc_length)
+        matched = scores > 0
+        scores[matched] /= self.doc_self_scores[matched]
+        return scores
+
+    def _allowed_mask(self, stack_key, skill_level):
+        cache_key = (stack_key, skill_level)
+        if cache_key in self._allowed_masks:
+            return self._allowed_masks[cache_key]
+        tech_ids = [self.technology_ids[tech] for tech in stack_key if tech in self.technology_ids]
+        allowed = None
+        if tech_ids:
+            allowed = np.isin(self.doc_tech, tech_ids)
+            if skill_level in SKILL_LEVELS:
+                allowed &= (self.doc_levels & (1 << SKILL_LEVELS.index(skill_level))) != 0
+        if len(self._allowed_masks) >= MAX_CACHED_FILTERS:
+            self._allowed_masks.clear()
+        self._allowed_masks[cache_key] = allowed
+        return allowed
+
+
+def load_question_bank(bank_path, index_dir, catalog):
+    """
+    Load the question bank index, rebuilding it first if the bank file changed.
+
+    Args:
+        bank_path (str): Path to the question bank JSON file
+        index_dir (str): Directory holding the index
+        catalog (TechCatalog): Catalog the bank's technology names are resolved against
+
+    Returns:
+        QuestionBank: The loaded index
+    """
+    meta_path = os.path.join(index_dir, "meta.json")
+    source_stat = os.stat(bank_path)
+    stale = True
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        stale = (meta.get("source_mtime_ns") != source_stat.st_mtime_ns
+                 or meta.get("source_size") != source_stat.st_size)
+    if stale:
+        build_index(bank_path, index_dir)
+    return QuestionBank(index_dir, catalog)
@@ -0,0 +1,200 @@
+import threading
+import time
+from collections import deque
+
+# Priority classes, lower value is served first
+PRIORITY_INTERACTIVE = 0  # Live turns: follow-ups, clarifications, error recovery
+PRIORITY_OPENING = 1  # Opening question of a new interview
+PRIORITY_BACKGROUND = 2  # Conclusions and evaluations
+PRIORITY_SPECULATIVE = 3  # Speculative prefill; never queued, see RequestScheduler.try_run
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_OPENING: "opening",
+    PRIORITY_BACKGROUND: "background",
+    PRIORITY_SPECULATIVE: "speculative"
+}
+
+# Per-class concurrency; on top of these, non-interactive classes together
+# never take the last slot (see RequestScheduler._next_ticket)
+DEFAULT_CLASS_LIMITS = {
+    PRIORITY_INTERACTIVE: 2,
+    PRIORITY_OPENING: 1,
+    PRIORITY_BACKGROUND: 1,
+    PRIORITY_SPECULATIVE: 1
+}
+
+DEFAULT_QUEUE_LIMITS = {
+    PRIORITY_INTERACTIVE: 8,
+    PRIORITY_OPENING: 4,
+    PRIORITY_BACKGROUND: 4,
+    PRIORITY_SPECULATIVE: 0
+}
+
+
+class SchedulerBusyError(RuntimeError):
+    """Raised when a priority class queue is full and the request is rejected."""
+
+
+class RequestScheduler:
+    """
+    Admit generation requests to the model in priority order.
+
+    Requests wait in one FIFO queue per priority class. Whenever a slot frees
+    up, the oldest request of the highest priority class that is still under
+    its concurrency limit is started. All non-interactive classes together
+    are kept to max_concurrency - 1 running, so a live turn never waits
+    behind long openings, conclusions or evaluations. A request arriving at
+    a full queue is rejected with SchedulerBusyError instead of waiting.
+    """
+
+    def __init__(self, max_concurrency=2, class_limits=None, queue_limits=None, metrics_window=1000):
+        """
+        Args:
+            max_concurrency (int): Total number of generations allowed to run at once.
+            class_limits (dict, optional): Maximum concurrent generations per priority class.
+            queue_limits (dict, optional): Maximum number of waiting requests per priority class.
+            metrics_window (int): Number of recent queue waits kept per class for percentiles.
+        """
+        self.max_concurrency = max_concurrency
+        self.class_limits = dict(class_limits or DEFAULT_CLASS_LIMITS)
+        self.queue_limits = dict(queue_limits or DEFAULT_QUEUE_LIMITS)
+
+        self._condition = threading.Condition()
+        self._queues = {priority: deque() for priority in PRIORITY_NAMES}
+        self._running = {priority: 0 for priority in PRIORITY_NAMES}
+        self._completed = {priority: 0 for priority in PRIORITY_NAMES}
+        self._rejected = {priority: 0 for priority in PRIORITY_NAMES}
+        self._waits = {priority: deque(maxlen=metrics_window) for priority in PRIORITY_NAMES}
+        self._tickets = 0
+
+    def run(self, priority, fn, *args, **kwargs):
+        """
+        Wait for a slot at the given priority, then call fn(*args, **kwargs).
+
+        Args:
+            priority (int): One of the PRIORITY_* classes.
+            fn (callable): The work to run once admitted.
+
+        Returns:
+            The return value of fn.
+
+        Raises:
+            SchedulerBusyError: If the queue for this priority class is full.
+        """
+        self._acquire(priority)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._release(priority)
+
+    def try_run(self, priority, fn, *args, **kwargs):
+        """
+        Call fn(*args, **kwargs) only if it can start right away without taking
+        the last free slot, otherwise reject it.
+
+        Meant for speculative work: it never waits, never overtakes a queued
+        request and never leaves a ticket behind.
+
+        Args:
+            priority (int): One of the PRIORITY_* classes.
+            fn (callable): The work to run if admitted.
+
+        Returns:
+            The return value of fn.
+
+        Raises:
+            SchedulerBusyError: If no slot can be spared right now.
+        """
+        self._try_acquire(priority)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._release(priority)
+
+    def _try_acquire(self, priority):
+        with self._condition:
+            has_room = (
+                not any(self._queues.values())
+                and sum(self._running.values()) + 1 < self.max_concurrency
+                and self._running[priority] < self.class_limits[priority]
+            )
+            if not has_room:
+                self._rejected[priority] += 1
+                raise SchedulerBusyError(f"No free slot for {PRIORITY_NAMES[priority]} work.")
+            self._running[priority] += 1
+            self._waits[priority].append(0.0)
+
+    def _acquire(self, priority):
+        with self._condition:
+            queue = self._queues[priority]
+            if len(queue) >= self.queue_limits[priority]:
+                self._rejected[priority] += 1
+                raise SchedulerBusyError(
+                    f"Too many pending {PRIORITY_NAMES[priority]} requests, please try again shortly."
+                )
+
+            self._tickets += 1
+            ticket = self._tickets
+            queue.append(ticket)
+            enqueued_at = time.monotonic()
+
+            while self._next_ticket() != ticket:
+                self._condition.wait()
+
+            queue.popleft()
+            self._running[priority] += 1
+            self._waits[priority].append(time.monotonic() - enqueued_at)
+            # Another class may still have room for its head request
+            self._condition.notify_all()
+
+    def _release(self, priority):
+        with self._condition:
+            self._running[priority] -= 1
+            self._completed[priority] += 1
+            self._condition.notify_all()
+
+    def _next_ticket(self):
+        # Head of the highest priority queue that may start right now
+        running = sum(self._running.values())
+        if running >= self.max_concurrency:
+            return None
+        # One slot is reserved for live turns whenever there is more than one
+        non_interactive_limit = max(self.max_concurrency - 1, 1)
+        non_interactive_running = running - self._running[PRIORITY_INTERACTIVE]
+        for priority in sorted(self._queues):
+            queue = self._queues[priority]
+            if not queue or self._running[priority] >= self.class_limits[priority]:
+                continue
+            if priority != PRIORITY_INTERACTIVE and non_interactive_running >= non_interactive_limit:
+                continue
+            return queue[0]
+        return None
+
+    def stats(self):
+        """
+        Snapshot of queue depth, concurrency and queue-wait percentiles per class.
+
+        Returns:
+            dict: Metrics keyed by priority class name.
+        """
+        with self._condition:
+            snapshot = {}
+            for priority, name in PRIORITY_NAMES.items():
+                waits = sorted(self._waits[priority])
+                snapshot[name] = {
+                    "queued": len(self._queues[priority]),
+                    "running": self._running[priority],
+                    "completed": self._completed[priority],
+                    "rejected": self._rejected[priority],
+                    "wait_p50_ms": _percentile(waits, 0.50) * 1000,
+                    "wait_p95_ms": _percentile(waits, 0.95) * 1000
+                }
+            return snapshot
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
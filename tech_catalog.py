@@ -0,0 +1,214 @@
+import difflib
+import json
+import os
+import re
+import sys
+from array import array
+
+_KEY_PATTERN = re.compile(r"[^a-z0-9+#]")
+
+# Trigram candidates scored with difflib per search
+MAX_FUZZY_CANDIDATES = 50
+
+# Minimum difflib ratio for a fuzzy match; lower values mostly add noise,
+# e.g. "node" matching "dotnet"
+MIN_FUZZY_SCORE = 0.7
+
+# Scores at or above this are exact or prefix matches
+_PREFIX_SCORE = 2.0
+
+
+def normalize_key(text):
+    """
+    Reduce a technology name or alias to its lookup key.
+
+    Case, spaces and punctuation other than "+" and "#" are dropped, so
+    "Vue.js", "vuejs" and "VUE JS" share a key while "C++" and "C#" stay apart.
+
+    Args:
+        text (str): Name, alias or search query
+
+    Returns:
+        str: The normalized key
+    """
+    return _KEY_PATTERN.sub("", text.lower())
+
+
+def _trigrams(key):
+    padded = f"^^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TechCatalog:
+    """
+    Index of selectable technologies keyed by compact integer IDs.
+
+    Everything the sidebar and the prompt builders need is precomputed once:
+    per-category option lists, an alias lookup table and a trigram index for
+    fuzzy search. Stacks are represented as tuples of IDs, which are cheap to
+    compare and hash and double as cache keys.
+    """
+
+    def __init__(self, entries):
+        """
+        Args:
+            entries (list): Dicts with name, category, description and optional aliases
+        """
+        self.names = tuple(sys.intern(entry["name"]) for entry in entries)
+        self.descriptions = tuple(entry.get("description", "") for entry in entries)
+
+        self.categories = tuple(dict.fromkeys(sys.intern(entry["category"]) for entry in entries))
+        category_ids = {category: i for i, category in enumerate(self.categories)}
+        self._category_of = array("H", (category_ids[entry["category"]] for entry in entries))
+
+        members = {category: [] for category in self.categories}
+        for tech_id, entry in enumerate(entries):
+            members[entry["category"]].append(self.names[tech_id])
+        self._category_options = {category: tuple(names) for category, names in members.items()}
+
+        # Exact lookup by name or alias; names win over aliases on collisions
+        self._ids_by_key = {}
+        for tech_id, entry in enumerate(entries):
+            for alias in entry.get("aliases", ()):
+                self._ids_by_key.setdefault(normalize_key(alias), tech_id)
+        for tech_id, name in enumerate(self.names):
+            self._ids_by_key[normalize_key(name)] = tech_id
+
+        self._trigram_index = {}
+        for key in self._ids_by_key:
+            for trigram in _trigrams(key):
+                self._trigram_index.setdefault(trigram, []).append(key)
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Build a catalog from a JSON list of technology entries.
+
+        Args:
+            path (str): Path to the catalog JSON file
+
+        Returns:
+            TechCatalog: The indexed catalog
+        """
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, text):
+        """
+        Find a technology by exact name or alias, ignoring case and punctuation.
+
+        Args:
+            text (str): Name or alias
+
+        Returns:
+            int: Technology ID, or None if unknown
+        """
+        return self._ids_by_key.get(normalize_key(text))
+
+    def category(self, tech_id):
+        """
+        Args:
+            tech_id (int): Technology ID
+
+        Returns:
+            str: Category the technology belongs to
+        """
+        return self.categories[self._category_of[tech_id]]
+
+    def category_options(self, category):
+        """
+        Args:
+            category (str): Category name
+
+        Returns:
+            tuple: Technology names in the category, in catalog order
+        """
+        return self._category_options[category]
+
+    def search(self, query, limit=10):
+        """
+        Search names and aliases, tolerating typos.
+
+        If any name or alias equals or starts with the query, only those
+        matches are returned, exact first. Otherwise keys sharing trigrams
+        with the query are ranked by similarity, down to MIN_FUZZY_SCORE.
+
+        Args:
+            query (str): Search text
+            limit (int): Maximum number of results
+
+        Returns:
+            list: Technology IDs, best match first
+        """
+        query_key = normalize_key(query)
+        if not query_key:
+            return []
+
+        shared = {}
+        for trigram in _trigrams(query_key):
+            for key in self._trigram_index.get(trigram, ()):
+                shared[key] = shared.get(key, 0) + 1
+        candidates = sorted(shared, key=shared.get, reverse=True)[:MAX_FUZZY_CANDIDATES]
+        if query_key in self._ids_by_key and query_key not in candidates:
+            candidates.append(query_key)
+
+        best = {}
+        for key in candidates:
+            if key == query_key:
+                score = _PREFIX_SCORE + 1.0
+            elif key.startswith(query_key):
+                score = _PREFIX_SCORE + len(query_key) / len(key)
+            else:
+                score = difflib.SequenceMatcher(None, query_key, key).ratio()
+            tech_id = self._ids_by_key[key]
+            if score > best.get(tech_id, 0):
+                best[tech_id] = score
+
+        min_score = _PREFIX_SCORE if max(best.values(), default=0) >= _PREFIX_SCORE else MIN_FUZZY_SCORE
+        ranked = sorted((tech_id for tech_id, score in best.items() if score >= min_score), key=best.get, reverse=True)
+        return ranked[:limit]
+
+    def normalize_stack(self, names):
+        """
+        Convert selected names or aliases into a compact stack.
+
+        Duplicates and unknown names are dropped. Input order is kept because
+        the first technology is treated as the primary one.
+
+        Args:
+            names (iterable): Technology names or aliases
+
+        Returns:
+            tuple: Technology IDs
+        """
+        ids = (self.lookup(name) for name in names)
+        return tuple(dict.fromkeys(tech_id for tech_id in ids if tech_id is not None))
+
+    def stack_names(self, stack):
+        """
+        Args:
+            stack (tuple): Technology IDs
+
+        Returns:
+            list: Technology names in stack order
+        """
+        return [self.names[tech_id] for tech_id in stack]
+
+    def stack_key(self, stack):
+        """
+        Build an order-independent cache key for a stack.
+
+        Args:
+            stack (tuple): Technology IDs
+
+        Returns:
+            tuple: Sorted technology IDs
+        """
+        return tuple(sorted(stack))
+
+
+# Shared catalog, built once when the module is first imported
+TECH_CATALOG = TechCatalog.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "tech_catalog.json"))
@@ -0,0 +1,259 @@
+import argparse
+import datetime
+import hashlib
+import logging
+import threading
+import uuid
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# One row per conversation turn
+TRANSCRIPT_SCHEMA = pa.schema([
+    ("interview_id", pa.string()),
+    ("turn", pa.int32()),
+    ("role", pa.string()),
+    ("content", pa.string()),
+    ("template", pa.string()),
+    ("prompt_tokens", pa.int32()),
+    ("completion_tokens", pa.int32()),
+    ("latency_ms", pa.float32()),
+    ("skill_level", pa.string()),
+    ("tech_stack", pa.list_(pa.string())),
+    ("stack", pa.string()),
+    ("date", pa.string()),
+    ("primary_tech", pa.string())
+])
+
+# The full stack stays a regular column; partitioning on it would create one
+# directory per combination, with names too long for the filesystem
+PARTITION_COLUMNS = ["date", "primary_tech"]
+
+# Longer partition values are replaced by a hash so directory names stay short
+MAX_PARTITION_VALUE_LENGTH = 64
+
+PARTITIONING = ds.partitioning(
+    pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]),
+    flavor="hive"
+)
+
+
+def stack_key(tech_stack):
+    """
+    Build an order-independent value identifying a tech stack.
+
+    Args:
+        tech_stack (list): Technologies covered in the interview
+
+    Returns:
+        str: Sorted technologies joined with "|"
+    """
+    return "|".join(sorted(tech_stack)) if tech_stack else "none"
+
+
+def primary_tech_partition_key(tech_stack):
+    """
+    Build a bounded partition value from the first technology of a stack.
+
+    Args:
+        tech_stack (list): Technologies covered in the interview, primary first
+
+    Returns:
+        str: The primary technology, or a short hash of it if it is too long
+    """
+    if not tech_stack:
+        return "none"
+    primary = tech_stack[0]
+    if len(primary) > MAX_PARTITION_VALUE_LENGTH:
+        return hashlib.sha1(primary.encode("utf-8")).hexdigest()[:16]
+    return primary
+
+
+class TranscriptExporter:
+    """
+    Buffer completed interviews and write them as a Parquet dataset
+    partitioned by date and primary technology.
+
+    Rows are accumulated column by column and written in batches, so busy
+    deployments produce a few reasonably sized files instead of one tiny
+    file per interview. A batch is written once `batch_rows` turns or
+    `batch_interviews` interviews are buffered, and a background thread
+    writes whatever is buffered every `flush_interval` seconds, so a crash
+    loses at most that much.
+    """
+
+    def __init__(self, root_dir, batch_rows=5000, batch_interviews=20, flush_interval=60.0):
+        """
+        Args:
+            root_dir (str): Directory the dataset is written to.
+            batch_rows (int): Number of buffered turns that triggers a write.
+            batch_interviews (int): Number of buffered interviews that triggers a write.
+            flush_interval (float, optional): Seconds between background flushes,
+                or None to only flush on the thresholds and explicit flush() calls.
+        """
+        self.root_dir = root_dir
+        self.batch_rows = batch_rows
+        self.batch_interviews = batch_interviews
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._columns = self._empty_columns()
+        self._buffered_interviews = 0
+        self._closed = threading.Event()
+        if flush_interval is not None:
+            threading.Thread(target=self._flush_periodically, daemon=True).start()
+
+    def _empty_columns(self):
+        return {field.name: [] for field in TRANSCRIPT_SCHEMA}
+
+    def add_interview(self, conversation_history, skill_level, tech_stack, interview_id=None, completed_at=None):
+        """
+        Queue every turn of a completed interview for export.
+
+        Args:
+            conversation_history (list): Messages with role, content and optional generation stats
+            skill_level (str): Candidate skill level
+            tech_stack (list): Technologies covered in the interview
+            interview_id (str, optional): Identifier for the interview, generated if omitted
+            completed_at (datetime.datetime, optional): Completion time, defaults to now
+
+        Returns:
+            str: The interview id the rows were written under
+        """
+        interview_id = interview_id or uuid.uuid4().hex
+        completed_at = completed_at or datetime.datetime.now(datetime.timezone.utc)
+        date = completed_at.strftime("%Y-%m-%d")
+        stack = stack_key(tech_stack)
+        primary_tech = primary_tech_partition_key(tech_stack)
+
+        with self._lock:
+            columns = self._columns
+            for turn, message in enumerate(conversation_history):
+                columns["interview_id"].append(interview_id)
+                columns["turn"].append(turn)
+                columns["role"].append(message["role"])
+                columns["content"].append(message["content"])
+                columns["template"].append(message.get("template"))
+                columns["prompt_tokens"].append(message.get("prompt_tokens"))
+                columns["completion_tokens"].append(message.get("completion_tokens"))
+                columns["latency_ms"].append(message.get("latency_ms"))
+                columns["skill_level"].append(skill_level)
+                columns["tech_stack"].append(list(tech_stack))
+                columns["stack"].append(stack)
+                columns["date"].append(date)
+                columns["primary_tech"].append(primary_tech)
+
+            self._buffered_interviews += 1
+            if len(columns["turn"]) >= self.batch_rows or self._buffered_interviews >= self.batch_interviews:
+                self._flush_locked()
+
+        return interview_id
+
+    def flush(self):
+        """
+        Write any buffered turns to disk.
+
+        A failed write is logged and its rows are dropped, so an export
+        problem never blocks ending an interview or later flushes.
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Stop the background flush thread and write any buffered turns."""
+        self._closed.set()
+        self.flush()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def _flush_locked(self):
+        if not self._columns["turn"]:
+            return
+        # Swap the buffer out before writing so a failure can't wedge it
+        columns, self._columns = self._columns, self._empty_columns()
+        self._buffered_interviews = 0
+        try:
+            table = pa.Table.from_pydict(columns, schema=TRANSCRIPT_SCHEMA)
+            pq.write_to_dataset(
+                table,
+                root_path=self.root_dir,
+                partition_cols=PARTITION_COLUMNS,
+                existing_data_behavior="overwrite_or_ignore"
+            )
+        except Exception:
+            logger.exception("Dropped %d transcript rows that could not be written to %s", len(columns["turn"]), self.root_dir)
+
+
+def summarize_transcripts(root_dir, group_by=("stack", "template"), since=None, until=None):
+    """
+    Compute aggregate turn statistics over an exported transcript dataset.
+
+    Only the grouping and metric columns are read, and date partitions
+    outside the requested range are skipped entirely.
+
+    Args:
+        root_dir (str): Directory the dataset was written to
+        group_by (tuple): Columns to group by
+        since (str, optional): First date to include, as YYYY-MM-DD
+        until (str, optional): Last date to include, as YYYY-MM-DD
+
+    Returns:
+        pyarrow.Table: One row per group with turn counts, token totals and latency stats
+    """
+    dataset = ds.dataset(root_dir, format="parquet", partitioning=PARTITIONING)
+
+    date_filter = None
+    if since:
+        date_filter = ds.field("date") >= since
+    if until:
+        until_filter = ds.field("date") <= until
+        date_filter = until_filter if date_filter is None else date_filter & until_filter
+
+    metric_columns = ["interview_id", "prompt_tokens", "completion_tokens", "latency_ms"]
+    columns = list(dict.fromkeys(list(group_by) + metric_columns))
+    table = dataset.to_table(columns=columns, filter=date_filter)
+
+    summary = table.group_by(list(group_by)).aggregate([
+        ("interview_id", "count"),
+        ("interview_id", "count_distinct"),
+        ("prompt_tokens", "sum"),
+        ("completion_tokens", "sum"),
+        ("latency_ms", "mean"),
+        ("latency_ms", "max")
+    ])
+    renamed = {"interview_id_count": "turns", "interview_id_count_distinct": "interviews"}
+    return summary.rename_columns([renamed.get(name, name) for name in summary.column_names])
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return "" if value is None else str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate statistics over exported interview transcripts")
+    parser.add_argument("root_dir", help="Directory the transcript dataset was written to")
+    parser.add_argument("--group-by", nargs="+", default=["stack", "template"],
+                        help="Columns to group by (e.g. date stack role template skill_level)")
+    parser.add_argument("--since", help="First date to include (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Last date to include (YYYY-MM-DD)")
+    parser.add_argument("--sort-by", default="turns",
+                        help="Result column to sort by, descending")
+    args = parser.parse_args()
+
+    summary = summarize_transcripts(args.root_dir, group_by=tuple(args.group_by), since=args.since, until=args.until)
+    if args.sort_by in summary.column_names:
+        summary = summary.take(pc.sort_indices(summary, sort_keys=[(args.sort_by, "descending")]))
+
+    print("\t".join(summary.column_names))
+    for row in summary.to_pylist():
+        print("\t".join(_format_value(value) for value in row.values()))
+
+
+if __name__ == "__main__":
+    main()